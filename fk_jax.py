@@ -0,0 +1,32 @@
+"""
+JAX-compiled batched forward kinematics for the URDF joint chain
+Evaluates many joint-angle vectors in a single XLA kernel
+"""
+
+try:
+    import jax
+    import jax.numpy as jnp
+    JAX_AVAILABLE = True
+except ImportError:  # JAX is optional; the visualizer falls back to NumPy
+    JAX_AVAILABLE = False
+
+
+if JAX_AVAILABLE:
+    @jax.jit
+    def fk_batch(T_origin, origin_plane, origin_plane_perp, angles):
+        """Forward kinematics for a (B, N) batch of joint angles -> (B, N, 4, 4)
+
+        Takes the joint stacks URDFModel precomputes at parse time and uses the
+        same column form as URDFModel._chain_transforms:
+        local = T_origin + (cos - 1) * origin_plane + sin * origin_plane_perp.
+        """
+        q = angles[:, :, None, None]
+        local = T_origin + (jnp.cos(q) - 1.0) * origin_plane + jnp.sin(q) * origin_plane_perp
+
+        def step(parent, T_local):
+            current = parent @ T_local
+            return current, current
+
+        init = jnp.broadcast_to(jnp.eye(4), (angles.shape[0], 4, 4))
+        _, transforms = jax.lax.scan(step, init, jnp.swapaxes(local, 0, 1))
+        return jnp.swapaxes(transforms, 0, 1)
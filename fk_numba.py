@@ -0,0 +1,74 @@
+"""
+Numba-compiled forward kinematics for the URDF joint chain
+Chains precomputed joint origin transforms and joint rotations without NumPy dispatch
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional; the visualizer falls back to NumPy
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when Numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _rotate_columns(T, a, b, c, s):
+    """Right-multiply T in place by a planar rotation mixing columns a and b"""
+    for r in range(4):
+        ta = T[r, a]
+        tb = T[r, b]
+        T[r, a] = c * ta + s * tb
+        T[r, b] = -s * ta + c * tb
+
+
+@njit(cache=True)
+def _matmul4(A, B, out):
+    """out = A @ B for 4x4 matrices"""
+    for r in range(4):
+        for col in range(4):
+            acc = 0.0
+            for k in range(4):
+                acc += A[r, k] * B[k, col]
+            out[r, col] = acc
+
+
+@njit(cache=True, fastmath=True)
+def fk_chain(angles, T_origin, axis_idx, out):
+    """Fill out[i] with the world transform of joint i.
+
+    T_origin is the (N, 4, 4) stack of joint origin transforms and axis_idx
+    the dominant rotation axis of each joint (0/1/2 for x/y/z, -1 for none),
+    both precomputed at parse time. Mirrors
+    URDFModel._forward_kinematics in urdf_model.py.
+    """
+    T_joint = np.empty((4, 4))
+
+    for i in range(angles.shape[0]):
+        T_joint[:, :] = T_origin[i]
+
+        # Joint rotation about axis k mixes columns (k + 1) % 3 and (k + 2) % 3
+        k = axis_idx[i]
+        if k >= 0:
+            _rotate_columns(T_joint, (k + 1) % 3, (k + 2) % 3,
+                            np.cos(angles[i]), np.sin(angles[i]))
+
+        if i == 0:
+            out[0, :, :] = T_joint
+        else:
+            _matmul4(out[i - 1], T_joint, out[i])
+
+    return out
+
+
+# Compile (or load from the on-disk cache) at import so the first slider
+# update does not pay the JIT cost
+if NUMBA_AVAILABLE:
+    fk_chain(np.zeros(1), np.eye(4).reshape(1, 4, 4), np.zeros(1, dtype=np.int8),
+             np.empty((1, 4, 4)))
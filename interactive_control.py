@@ -3,8 +3,9 @@ Interactive Robot Arm Control with Joint Angle Sliders
 Uses Plotly Dash for real-time control of all 6 joint angles
 """
 
-import numpy as np
-from dash import Dash, dcc, html, Input, Output, State
+import math
+
+from dash import Dash, dcc, html, Input, Output, State, Patch, ctx
 import plotly.graph_objects as go
 from visualization import PlotlyURDFVisualizer
 
@@ -27,6 +28,9 @@ COLORS = {
     'border': '#BDC3C7',       # Border gray
 }
 
+# Radians to degrees for per-update display formatting
+_RAD2DEG = 180.0 / math.pi
+
 # Get joint limits for sliders
 joint_limits = []
 for joint in visualizer.joints:
@@ -39,10 +43,15 @@ for joint in visualizer.joints:
 # Preset configurations
 presets = {
     'Home': [0, 0, 0, 0, 0, 0],
-    'Config 1': [0, -np.pi/2, -np.pi/3, -np.pi/4, -np.pi/2, 0],
-    'Vertical': [0, -np.pi/2, 0, 0, 0, 0],
-    'Reach Forward': [0, -np.pi/4, -np.pi/4, -np.pi/4, 0, 0],
+    'Config 1': [0, -math.pi/2, -math.pi/3, -math.pi/4, -math.pi/2, 0],
+    'Vertical': [0, -math.pi/2, 0, 0, 0, 0],
+    'Reach Forward': [0, -math.pi/4, -math.pi/4, -math.pi/4, 0, 0],
 }
+PRESET_NAMES = tuple(presets)
+
+# Preset angle vectors converted once for the callbacks (full float precision)
+PRESETS = {name: tuple(float(angle) for angle in angles) for name, angles in presets.items()}
+ZEROS = (0.0,) * 6
 
 # Slider styling
 slider_style = {
@@ -55,6 +64,48 @@ slider_style = {
     'transition': 'all 0.3s ease'
 }
 
+# Slider mark styles, shared by every slider
+MARK_STYLE_EDGE = {'color': COLORS['text_light'], 'fontSize': '11px', 'fontFamily': "'Segoe UI', 'Roboto', sans-serif"}
+MARK_STYLE_ZERO = {'color': COLORS['success'], 'fontSize': '12px', 'fontWeight': '600', 'fontFamily': "'Segoe UI', 'Roboto', sans-serif"}
+
+# Min / zero / max marks for each joint slider
+_MARKS = [
+    {
+        limits['min']: {'label': f"{limits['min'] * _RAD2DEG:.0f}°", 'style': MARK_STYLE_EDGE},
+        0: {'label': '0°', 'style': MARK_STYLE_ZERO},
+        limits['max']: {'label': f"{limits['max'] * _RAD2DEG:.0f}°", 'style': MARK_STYLE_EDGE},
+    }
+    for limits in joint_limits
+]
+
+joint_badge_style = {
+    'backgroundColor': COLORS['secondary'],
+    'color': 'white',
+    'padding': '4px 10px',
+    'borderRadius': '6px',
+    'fontSize': '14px',
+    'fontWeight': '700',
+    'marginRight': '10px',
+    'fontFamily': "'Segoe UI', 'Roboto', monospace"
+}
+
+joint_name_style = {
+    'color': COLORS['text'],
+    'fontSize': '15px',
+    'fontWeight': '500',
+    'fontFamily': "'Segoe UI', 'Roboto', sans-serif"
+}
+
+joint_label_style = {'display': 'flex', 'alignItems': 'center', 'marginBottom': '10px'}
+
+slider_output_style = {
+    'marginTop': '8px',
+    'fontSize': '13px',
+    'color': COLORS['text_light'],
+    'textAlign': 'center',
+    'fontFamily': "'Segoe UI', 'Roboto', monospace"
+}
+
 button_base_style = {
     'margin': '6px',
     'padding': '12px 24px',
@@ -84,6 +135,59 @@ reset_button_style = {
     'marginTop': '20px'
 }
 
+def create_figure(joint_angles):
+    """Build the full robot figure with the static scene layout"""
+    fig = go.Figure(data=visualizer.create_robot_traces(joint_angles))
+    
+    fig.update_layout(
+        title={
+            'text': "myCobot 320 Pi - Real-time Visualization",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 18, 'color': COLORS['primary'], 'family': "'Segoe UI', 'Roboto', sans-serif"}
+        },
+        scene=dict(
+            xaxis=dict(
+                range=[-0.25, 0.25],
+                title='X (m)',
+                backgroundcolor=COLORS['background'],
+                gridcolor=COLORS['border'],
+                showbackground=True
+            ),
+            yaxis=dict(
+                range=[-0.25, 0.25],
+                title='Y (m)',
+                backgroundcolor=COLORS['background'],
+                gridcolor=COLORS['border'],
+                showbackground=True
+            ),
+            zaxis=dict(
+                range=[0, 0.5],
+                title='Z (m)',
+                backgroundcolor=COLORS['background'],
+                gridcolor=COLORS['border'],
+                showbackground=True
+            ),
+            aspectmode='manual',
+            aspectratio=dict(x=1, y=1, z=1),
+            camera=dict(
+                eye=dict(x=1.3, y=1.3, z=1.0),
+                center=dict(x=0, y=0, z=0.25)
+            )
+        ),
+        showlegend=False,
+        margin=dict(l=0, r=0, b=0, t=50),
+        uirevision='constant',  # Maintain camera position during updates
+        paper_bgcolor=COLORS['card'],
+        plot_bgcolor=COLORS['card']
+    )
+    
+    return fig
+
+# Figure served with the page; callbacks only patch trace coordinates
+initial_figure = create_figure([0, 0, 0, 0, 0, 0])
+N_STATIC_TRACES = len(visualizer.static_traces)
+
 # Create layout
 app.layout = html.Div([
     # Header
@@ -137,7 +241,7 @@ app.layout = html.Div([
                            }),
                     html.Div([
                         html.Button(name, id=f'preset-{name}', style=preset_button_style)
-                        for name in presets.keys()
+                        for name in PRESET_NAMES
                     ], style={'marginBottom': '25px', 'display': 'flex', 'flexWrap': 'wrap'}),
                 ], style={
                     'padding': '20px',
@@ -153,54 +257,20 @@ app.layout = html.Div([
                     html.Div([
                         html.Div([
                             html.Label([
-                                html.Span(f'C{i+1}', style={
-                                    'backgroundColor': COLORS['secondary'],
-                                    'color': 'white',
-                                    'padding': '4px 10px',
-                                    'borderRadius': '6px',
-                                    'fontSize': '14px',
-                                    'fontWeight': '700',
-                                    'marginRight': '10px',
-                                    'fontFamily': "'Segoe UI', 'Roboto', monospace"
-                                }),
-                                html.Span(f'{joint_limits[i]["name"]}', style={
-                                    'color': COLORS['text'],
-                                    'fontSize': '15px',
-                                    'fontWeight': '500',
-                                    'fontFamily': "'Segoe UI', 'Roboto', sans-serif"
-                                })
-                            ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '10px'}),
+                                html.Span(f'C{i+1}', style=joint_badge_style),
+                                html.Span(f'{joint_limits[i]["name"]}', style=joint_name_style)
+                            ], style=joint_label_style),
                             dcc.Slider(
                                 id=f'slider-{i}',
                                 min=joint_limits[i]['min'],
                                 max=joint_limits[i]['max'],
                                 value=0,
-                                marks={
-                                    joint_limits[i]['min']: {
-                                        'label': f'{np.degrees(joint_limits[i]["min"]):.0f}°',
-                                        'style': {'color': COLORS['text_light'], 'fontSize': '11px', 'fontFamily': "'Segoe UI', 'Roboto', sans-serif"}
-                                    },
-                                    0: {
-                                        'label': '0°',
-                                        'style': {'color': COLORS['success'], 'fontSize': '12px', 'fontWeight': '600', 'fontFamily': "'Segoe UI', 'Roboto', sans-serif"}
-                                    },
-                                    joint_limits[i]['max']: {
-                                        'label': f'{np.degrees(joint_limits[i]["max"]):.0f}°',
-                                        'style': {'color': COLORS['text_light'], 'fontSize': '11px', 'fontFamily': "'Segoe UI', 'Roboto', sans-serif"}
-                                    }
-                                },
+                                marks=_MARKS[i],
                                 tooltip={"placement": "bottom", "always_visible": True},
-                                updatemode='drag',
+                                updatemode='mouseup',
                                 className='custom-slider'
                             ),
-                            html.Div(id=f'output-{i}', 
-                                   style={
-                                       'marginTop': '8px',
-                                       'fontSize': '13px',
-                                       'color': COLORS['text_light'],
-                                       'textAlign': 'center',
-                                       'fontFamily': "'Segoe UI', 'Roboto', monospace"
-                                   }),
+                            html.Div(id=f'output-{i}', style=slider_output_style),
                         ]),
                     ], style=slider_style)
                     for i in range(6)
@@ -209,6 +279,9 @@ app.layout = html.Div([
                 # Reset button
                 html.Button('🔄 Reset to Home', id='reset-btn', style=reset_button_style),
                 
+                # Throttled slider angles consumed by the figure callback
+                dcc.Store(id='slider-angles', data={'angles': [0, 0, 0, 0, 0, 0]}),
+                
                 # Current angles display
                 html.Div([
                     html.H4("📊 Current Configuration", 
@@ -256,6 +329,7 @@ app.layout = html.Div([
         html.Div([
             dcc.Graph(
                 id='robot-graph',
+                figure=initial_figure,
                 style={'height': '100vh'},
                 config={
                     'displayModeBar': True,
@@ -344,100 +418,130 @@ app.index_string = '''
 </html>
 '''
 
-# Callback to update visualization
+# Angle bucket size (rad); dragging a slider fires many near-duplicate values,
+# so angles are snapped to this grid before hitting the visualizer's FK and
+# coordinate caches (static traces are not part of them)
+ANGLE_QUANTUM = 0.005
+
+# Minimum time between forwarded slider drag events (~30 Hz)
+SLIDER_THROTTLE_MS = 33
+
+# Callback to set sliders from the reset and preset buttons
 @app.callback(
-    [Output('robot-graph', 'figure')] + 
-    [Output(f'slider-{i}', 'value') for i in range(6)] +
-    [Output(f'output-{i}', 'children') for i in range(6)] +
-    [Output('angles-display', 'children')],
-    [Input(f'slider-{i}', 'value') for i in range(6)] +
+    [Output(f'slider-{i}', 'value') for i in range(6)],
     [Input('reset-btn', 'n_clicks')] +
-    [Input(f'preset-{name}', 'n_clicks') for name in presets.keys()],
-    prevent_initial_call=False
+    [Input(f'preset-{name}', 'n_clicks') for name in PRESET_NAMES],
+    prevent_initial_call=True
 )
-def update_robot(*args):
-    # Extract current slider values (first 6 arguments)
-    current_angles = list(args[:6])
+def apply_preset(*args):
+    button_id = ctx.triggered_id or ''
     
-    # Check which button was clicked
-    from dash import callback_context
-    if callback_context.triggered:
-        button_id = callback_context.triggered[0]['prop_id'].split('.')[0]
-        
-        if button_id == 'reset-btn':
-            current_angles = [0, 0, 0, 0, 0, 0]
-        elif button_id.startswith('preset-'):
-            preset_name = button_id.replace('preset-', '')
-            if preset_name in presets:
-                current_angles = presets[preset_name]
-    
-    # Create the robot traces
-    traces = visualizer.create_robot_traces(current_angles)
+    if button_id.startswith('preset-'):
+        preset_name = button_id[len('preset-'):]
+        if preset_name in PRESETS:
+            return list(PRESETS[preset_name])
     
-    # Create figure
-    fig = go.Figure(data=traces)
+    return list(ZEROS)
+
+# Clientside callback to coalesce slider drag events before they reach Python.
+# A slider is being dragged while its drag_value differs from its value (the
+# Slider also sets drag_value on mount and whenever value is set from code).
+# Drag events are forwarded at most every SLIDER_THROTTLE_MS: one inside the
+# window is held and the latest held one is forwarded when the window ends, so
+# pausing mid-drag still shows the current pose. Released (or programmatically
+# set) values are forwarded at once and drop any held drag event.
+app.clientside_callback(
+    '''
+    function() {
+        const n = arguments.length / 2;
+        const dragValues = Array.prototype.slice.call(arguments, 0, n);
+        const values = Array.prototype.slice.call(arguments, n);
+        const dragged = values.map((value, i) =>
+            dragValues[i] !== undefined && dragValues[i] !== null && dragValues[i] !== value);
+        const dragging = dragged.some(d => d);
+        
+        // Each event supersedes any event still held for the end of a window
+        const token = (window.sliderSyncToken || 0) + 1;
+        window.sliderSyncToken = token;
+        
+        if (!dragging) {
+            return {angles: values};
+        }
+        
+        const state = {angles: values.map((value, i) => dragged[i] ? dragValues[i] : value)};
+        const wait = (window.sliderSyncTime || 0) + ''' + str(SLIDER_THROTTLE_MS) + ''' - Date.now();
+        if (wait <= 0) {
+            window.sliderSyncTime = Date.now();
+            return state;
+        }
+        
+        return new Promise(resolve => setTimeout(() => {
+            if (window.sliderSyncToken !== token) {
+                resolve(dash_clientside.no_update);
+                return;
+            }
+            window.sliderSyncTime = Date.now();
+            resolve(state);
+        }, wait));
+    }
+    ''',
+    Output('slider-angles', 'data'),
+    [Input(f'slider-{i}', 'drag_value') for i in range(6)] +
+    [Input(f'slider-{i}', 'value') for i in range(6)]
+)
+
+# Callback to update visualization
+@app.callback(
+    [Output('robot-graph', 'figure')] + 
+    [Output(f'output-{i}', 'children') for i in range(6)],
+    [Input('slider-angles', 'data')],
+    prevent_initial_call=False
+)
+def update_robot(slider_state):
+    current_angles = list(slider_state['angles'])
+    # Snap to a fine grid so revisited poses hit the visualizer's caches
+    angles = [round(angle / ANGLE_QUANTUM) * ANGLE_QUANTUM for angle in current_angles]
     
-    fig.update_layout(
-        title={
-            'text': "myCobot 320 Pi - Real-time Visualization",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'color': COLORS['primary'], 'family': "'Segoe UI', 'Roboto', sans-serif"}
-        },
-        scene=dict(
-            xaxis=dict(
-                range=[-0.25, 0.25],
-                title='X (m)',
-                backgroundcolor=COLORS['background'],
-                gridcolor=COLORS['border'],
-                showbackground=True
-            ),
-            yaxis=dict(
-                range=[-0.25, 0.25],
-                title='Y (m)',
-                backgroundcolor=COLORS['background'],
-                gridcolor=COLORS['border'],
-                showbackground=True
-            ),
-            zaxis=dict(
-                range=[0, 0.5],
-                title='Z (m)',
-                backgroundcolor=COLORS['background'],
-                gridcolor=COLORS['border'],
-                showbackground=True
-            ),
-            aspectmode='manual',
-            aspectratio=dict(x=1, y=1, z=1),
-            camera=dict(
-                eye=dict(x=1.3, y=1.3, z=1.0),
-                center=dict(x=0, y=0, z=0.25)
-            )
-        ),
-        showlegend=False,
-        margin=dict(l=0, r=0, b=0, t=50),
-        uirevision='constant',  # Maintain camera position during updates
-        paper_bgcolor=COLORS['card'],
-        plot_bgcolor=COLORS['card']
-    )
+    # Only send updated trace data; layout and camera are never part of the
+    # response. Each trace gets a single Merge operation.
+    fig = Patch()
+    for i, vertices in enumerate(visualizer.robot_coordinates(angles), start=N_STATIC_TRACES):
+        fig['data'][i].update({'x': vertices[:, 0], 'y': vertices[:, 1], 'z': vertices[:, 2]})
     
     # Create output labels for each slider with improved formatting
     slider_outputs = [
-        f"📍 {angle:.4f} rad  •  {np.degrees(angle):.2f}°"
+        f"📍 {angle:.4f} rad  •  {angle * _RAD2DEG:.2f}°"
         for angle in current_angles
     ]
     
-    # Create angles display text with improved formatting
-    angles_text = "╔═══════════════════════════════════════════════╗\n"
-    angles_text += "║         JOINT ANGLES CONFIGURATION           ║\n"
-    angles_text += "╠═══════════════════════════════════════════════╣\n"
-    for i, angle in enumerate(current_angles):
-        angles_text += f"║  C{i+1} (J{i+1})  │  {angle:>7.4f} rad  │  {np.degrees(angle):>7.2f}°  ║\n"
-    angles_text += "╠═══════════════════════════════════════════════╣\n"
-    angles_text += f"║  Array: [{', '.join([f'{a:>6.3f}' for a in current_angles])}]  ║\n"
-    angles_text += "╚═══════════════════════════════════════════════╝"
-    
-    # Return: figure, slider values (6), slider outputs (6), angles display
-    return [fig] + current_angles + slider_outputs + [angles_text]
+    # Return: figure patch, slider outputs (6)
+    return [fig] + slider_outputs
+
+# Clientside callback for the configuration box; it is pure formatting of the
+# slider angles, so it is built in the browser without a server roundtrip
+app.clientside_callback(
+    '''
+    function(sliderState) {
+        const angles = sliderState.angles;
+        const rad2deg = 180 / Math.PI;
+        const lines = [
+            "╔═══════════════════════════════════════════════╗",
+            "║         JOINT ANGLES CONFIGURATION           ║",
+            "╠═══════════════════════════════════════════════╣"
+        ];
+        angles.forEach((angle, i) => {
+            lines.push(`║  C${i+1} (J${i+1})  │  ${angle.toFixed(4).padStart(7)} rad  │  ` +
+                       `${(angle * rad2deg).toFixed(2).padStart(7)}°  ║`);
+        });
+        lines.push("╠═══════════════════════════════════════════════╣");
+        lines.push(`║  Array: [${angles.map(a => a.toFixed(3).padStart(6)).join(', ')}]  ║`);
+        lines.push("╚═══════════════════════════════════════════════╝");
+        return lines.join("\\n");
+    }
+    ''',
+    Output('angles-display', 'children'),
+    Input('slider-angles', 'data')
+)
 
 if __name__ == '__main__':
     print("\n" + "="*60)
@@ -3,7 +3,9 @@ Test preset configurations for the robot arm
 Simple script to visualize specific joint angle configurations
 """
 
-import numpy as np
+import math
+from functools import lru_cache
+
 from visualization import PlotlyURDFVisualizer
 import sys
 
@@ -16,26 +18,31 @@ configs = {
     },
     'config1': {
         'name': 'Configuration 1',
-        'angles': [0, -np.pi/2, -np.pi/3, -np.pi/4, -np.pi/2, 0],
+        'angles': [0, -math.pi/2, -math.pi/3, -math.pi/4, -math.pi/2, 0],
         'description': 'C1=0, C2=-π/2, C3=-π/3, C4=-π/4, C5=-π/2, C6=0'
     },
     'vertical': {
         'name': 'Vertical Reach',
-        'angles': [0, -np.pi/2, 0, 0, 0, 0],
+        'angles': [0, -math.pi/2, 0, 0, 0, 0],
         'description': 'Arm pointing straight up'
     },
     'forward': {
         'name': 'Forward Reach',
-        'angles': [0, -np.pi/4, -np.pi/4, -np.pi/4, 0, 0],
+        'angles': [0, -math.pi/4, -math.pi/4, -math.pi/4, 0, 0],
         'description': 'Arm reaching forward'
     },
     'side': {
         'name': 'Side Reach',
-        'angles': [np.pi/2, -np.pi/4, -np.pi/4, -np.pi/4, 0, 0],
+        'angles': [math.pi/2, -math.pi/4, -math.pi/4, -math.pi/4, 0, 0],
         'description': 'Arm reaching to the side'
     }
 }
 
+@lru_cache(maxsize=4)
+def _get_visualizer(urdf_file, show_inertia):
+    """Load a visualizer once per (URDF, mode) and reuse it across configs"""
+    return PlotlyURDFVisualizer(urdf_file, show_inertia=show_inertia)
+
 def visualize_config(config_name, show_inertia=False):
     """Visualize a specific configuration"""
     if config_name not in configs:
@@ -52,10 +59,10 @@ def visualize_config(config_name, show_inertia=False):
     print(f"\nDescription: {config['description']}")
     print("\nJoint Angles:")
     for i, angle in enumerate(angles):
-        print(f"  C{i+1} (Joint {i+1}): {angle:.4f} rad = {np.degrees(angle):.2f}°")
+        print(f"  C{i+1} (Joint {i+1}): {angle:.4f} rad = {math.degrees(angle):.2f}°")
     
-    # Create visualizer
-    visualizer = PlotlyURDFVisualizer('URDF/mycobotpro320.urdf', show_inertia=show_inertia)
+    # Get (cached) visualizer
+    visualizer = _get_visualizer('URDF/mycobotpro320.urdf', show_inertia)
     
     # Create figure with the specified angles
     import plotly.graph_objects as go
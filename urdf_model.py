@@ -0,0 +1,274 @@
+"""
+URDF kinematic model shared by the visualizers
+Parses joints and links once and computes forward kinematics
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+import xml.etree.ElementTree as ET
+
+from fk_numba import NUMBA_AVAILABLE, fk_chain
+from fk_jax import JAX_AVAILABLE
+
+if JAX_AVAILABLE:
+    from jax.tree_util import Partial
+    from fk_jax import fk_batch as _jax_fk_batch
+
+# Rows/columns of the 2x2 rotation block for a joint about x, y or z
+_ROTATION_PLANES = {0: (1, 2), 1: (2, 0), 2: (0, 1)}
+
+class URDFModel:
+    """Parsed URDF joints/links plus their forward kinematics"""
+    def __init__(self, urdf_file):
+        self.urdf_file = urdf_file
+        self.joints = []
+        self.links = []
+        self.parse_urdf()
+        
+    def parse_urdf(self):
+        """Parse the URDF file to extract joint and link information"""
+        # Single streaming pass; only direct children of <robot> are joints and
+        # links (a <transmission> may nest its own <joint> reference)
+        depth = 0
+        for event, elem in ET.iterparse(self.urdf_file, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 1:
+                continue
+            
+            if elem.tag == 'joint':
+                self.joints.append(self._parse_joint(elem))
+            elif elem.tag == 'link':
+                self.links.append({
+                    'name': elem.get('name'),
+                    'visual': self._parse_visual(elem.find('visual'))
+                })
+            elem.clear()
+        
+        # Stacked origin transforms and each joint's rotation axis (-1 if none)
+        self._T_origin_stack = np.array([j['T_origin'] for j in self.joints]).reshape(-1, 4, 4)
+        self._axis_idx = np.array([-1 if j['axis_idx'] is None else j['axis_idx'] for j in self.joints],
+                                  dtype=np.int8)
+        
+        # A joint rotation only mixes the two origin columns a, b of its plane:
+        #   local = T_origin + (cos - 1) * _origin_plane + sin * _origin_plane_perp
+        # where _origin_plane keeps columns a, b and _origin_plane_perp holds
+        # (col_b, -col_a); axis-less joints have zeros in both
+        self._origin_plane = np.zeros_like(self._T_origin_stack)
+        self._origin_plane_perp = np.zeros_like(self._T_origin_stack)
+        for i, (T_origin, idx) in enumerate(zip(self._T_origin_stack, self._axis_idx)):
+            if idx < 0:
+                continue
+            a, b = _ROTATION_PLANES[idx]
+            self._origin_plane[i][:, [a, b]] = T_origin[:, [a, b]]
+            self._origin_plane_perp[i][:, a] = T_origin[:, b]
+            self._origin_plane_perp[i][:, b] = -T_origin[:, a]
+        
+        # Fresh FK memo for the chain just parsed, see forward_kinematics
+        self._cached_fk = lru_cache(maxsize=1024)(self._forward_kinematics)
+        
+        # Bind the static joint constants to the JAX kernel once
+        if JAX_AVAILABLE:
+            self._jax_fk = Partial(_jax_fk_batch, self._T_origin_stack, self._origin_plane,
+                                   self._origin_plane_perp)
+    
+    def _parse_joint(self, joint):
+        joint_info = {
+            'name': joint.get('name'),
+            'type': joint.get('type'),
+            'parent': joint.find('parent').get('link'),
+            'child': joint.find('child').get('link'),
+            'origin': self._parse_origin(joint.find('origin')),
+            'axis': self._parse_axis(joint.find('axis')),
+            'limits': self._parse_limits(joint.find('limit'))
+        }
+        
+        # Static joint origin transform, reused by every FK call
+        joint_info['T_origin'] = self._origin_matrix(joint_info['origin'])
+        joint_info['axis_idx'] = self._dominant_axis(joint_info['axis'])
+        
+        return joint_info
+    
+    def _dominant_axis(self, axis):
+        """Index of the axis a joint rotates about (z, then y, then x), or None"""
+        for idx in (2, 1, 0):
+            if abs(axis[idx]) > 0.5:
+                return idx
+        return None
+    
+    def _parse_vector(self, text):
+        """Space-separated URDF triple (xyz, rpy, axis or box size) -> float64 array"""
+        vector = np.array([float(x) for x in text.split()])
+        if vector.shape != (3,):
+            raise ValueError(f"Expected 3 numbers in URDF vector, got {text!r}")
+        return vector
+    
+    def _parse_origin(self, origin):
+        if origin is None:
+            return {'xyz': np.zeros(3), 'rpy': np.zeros(3)}
+        return {
+            'xyz': self._parse_vector(origin.get('xyz', '0 0 0')),
+            'rpy': self._parse_vector(origin.get('rpy', '0 0 0'))
+        }
+    
+    def _origin_matrix(self, origin):
+        """4x4 transform of a parsed <origin>"""
+        T = np.eye(4)
+        # Plain floats: math trig on NumPy scalars is ~3x slower
+        T[:3, :3] = self.rotation_matrix(*origin['rpy'].tolist())
+        T[:3, 3] = origin['xyz']
+        return T
+    
+    def _parse_axis(self, axis):
+        if axis is None:
+            return np.array([0.0, 0.0, 1.0])
+        return self._parse_vector(axis.get('xyz', '0 0 1'))
+    
+    def _parse_limits(self, limit):
+        if limit is None:
+            return {'lower': -np.pi, 'upper': np.pi}
+        return {
+            'lower': float(limit.get('lower', -np.pi)),
+            'upper': float(limit.get('upper', np.pi))
+        }
+    
+    def _parse_visual(self, visual):
+        if visual is None:
+            return None
+        
+        geom = visual.find('geometry')
+        if geom is None:
+            return None
+            
+        origin = self._parse_origin(visual.find('origin'))
+        
+        # Static visual origin transform, computed once per link
+        visual_info = {'origin': origin, 'T_visual': self._origin_matrix(origin)}
+        
+        if geom.find('cylinder') is not None:
+            cyl = geom.find('cylinder')
+            visual_info['type'] = 'cylinder'
+            visual_info['radius'] = float(cyl.get('radius'))
+            visual_info['length'] = float(cyl.get('length'))
+        elif geom.find('box') is not None:
+            box = geom.find('box')
+            visual_info['type'] = 'box'
+            visual_info['size'] = self._parse_vector(box.get('size'))
+        elif geom.find('mesh') is not None:
+            mesh = geom.find('mesh')
+            visual_info['type'] = 'mesh'
+            visual_info['filename'] = mesh.get('filename')
+            # For mesh files, we'll create a simple box representation
+            # You can enhance this later to load actual mesh files
+            visual_info['size'] = np.full(3, 0.05)  # Default size for placeholder
+        else:
+            return None
+        
+        return visual_info
+    
+    def rotation_matrix(self, roll, pitch, yaw):
+        """Create a rotation matrix from roll, pitch, yaw angles (R_z @ R_y @ R_x)"""
+        cr, sr = math.cos(roll), math.sin(roll)
+        cp, sp = math.cos(pitch), math.sin(pitch)
+        cy, sy = math.cos(yaw), math.sin(yaw)
+        
+        return np.array([[cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+                         [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+                         [-sp, cp * sr, cp * cr]])
+    
+    def forward_kinematics(self, joint_angles):
+        """Calculate the forward kinematics for given joint angles -> (N, 4, 4) world transforms
+        
+        Memoized on the exact angles (slider values repeat as a joint is
+        dragged back and forth); the returned array is shared and read-only.
+        """
+        self._check_angle_count(len(joint_angles))
+        return self._cached_fk(tuple(float(a) for a in joint_angles[:len(self.joints)]))
+    
+    def _check_angle_count(self, n_angles):
+        """Raise if there are fewer angles than joints (extra ones are ignored)"""
+        if n_angles < len(self.joints):
+            raise ValueError(f"Expected {len(self.joints)} joint angles, got {n_angles}")
+    
+    def _forward_kinematics(self, joint_angles):
+        """Uncached forward_kinematics for a tuple of joint angles"""
+        n_joints = len(self.joints)
+        angles = np.array(joint_angles, dtype=np.float64)
+        
+        if NUMBA_AVAILABLE:
+            transforms = fk_chain(angles, self._T_origin_stack, self._axis_idx,
+                                  np.empty((n_joints, 4, 4)))
+            transforms.flags.writeable = False
+            return transforms
+        
+        # A batch of one; the output is fresh per call since it is cached
+        transforms = self._chain_transforms(angles[None])[0]
+        transforms.flags.writeable = False
+        return transforms
+    
+    def fk_batch(self, joint_angles):
+        """Forward kinematics for a (B, N) batch of joint angles -> (B, N, 4, 4) float64
+        
+        With JAX installed the kernel runs in JAX's default float32 (about 1e-7
+        off the NumPy result) and is cast back to float64, so callers see the
+        same dtype either way.
+        """
+        # Extra trailing angles are ignored, as in forward_kinematics
+        angles = np.atleast_2d(np.asarray(joint_angles, dtype=np.float64))
+        self._check_angle_count(angles.shape[1])
+        angles = angles[:, :len(self.joints)]
+        if JAX_AVAILABLE:
+            return np.asarray(self._jax_fk(angles), dtype=np.float64)
+        
+        return self._chain_transforms(angles)
+    
+    def _chain_transforms(self, angles):
+        """NumPy forward kinematics for a (B, N) float64 batch -> fresh (B, N, 4, 4)"""
+        # Every local transform at once, no rotation matrices built;
+        # accumulated in place to keep temporaries down
+        angles = angles[:, :, None, None]
+        local = (np.cos(angles) - 1.0) * self._origin_plane
+        local += np.sin(angles) * self._origin_plane_perp
+        local += self._T_origin_stack
+        
+        # Chain them, multiplying straight into the output (the only
+        # sequential part)
+        out = np.empty_like(local)
+        if len(self.joints):
+            out[:, 0] = local[:, 0]
+        for i in range(1, len(self.joints)):
+            np.matmul(out[:, i - 1], local[:, i], out=out[:, i])
+        
+        return out
+    
+    def _static_link_indices(self):
+        """Indices of links no joint angle can move (e.g. the base).
+        
+        Follows the FK chain and the mapping of _link_transform_stack: link n
+        is static while none of joints 1..n rotate. A type="fixed" joint still
+        rotates if it has an axis, exactly as forward_kinematics treats it.
+        """
+        rotates = np.logical_or.accumulate(self._axis_idx >= 0)
+        return {idx for idx in range(len(self.links))
+                if idx == 0 or idx > len(rotates) or not rotates[idx - 1]}
+    
+    def _link_transform_stack(self, transforms):
+        """Per-link world transforms: base link is fixed, link n follows joint n.
+        
+        transforms is (..., N, 4, 4), e.g. one pose or an fk_batch result;
+        returns (..., n_links, 4, 4).
+        """
+        transforms = np.asarray(transforms)
+        T_stack = np.tile(np.eye(4, dtype=np.float32), (*transforms.shape[:-3], len(self.links), 1, 1))
+        T_stack[..., 1:transforms.shape[-3] + 1, :, :] = transforms
+        return T_stack
+    
+    def joint_positions(self, transforms):
+        """Stack the base origin and each joint origin into an (N+1) x 3 float32 array"""
+        positions = np.zeros((len(transforms) + 1, 3), dtype=np.float32)
+        positions[1:] = np.asarray(transforms)[:, :3, 3]
+        return positions
@@ -4,420 +4,280 @@ Interactive 3D visualization of a 6-axis robotic arm with sliders
 Opens in your web browser with smooth animations
 """
 
+from functools import lru_cache
+
 import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
-import xml.etree.ElementTree as ET
 import argparse
 
-class PlotlyURDFVisualizer:
-    def __init__(self, urdf_file, show_inertia=False):
-        self.urdf_file = urdf_file
+from urdf_model import URDFModel
+
+try:
+    import pyvista as pv
+    PYVISTA_AVAILABLE = True
+except ImportError:  # PyVista is optional; only visualize_pyvista needs it
+    PYVISTA_AVAILABLE = False
+
+# orjson serializes figures (and their NumPy arrays) much faster than json
+pio.json.config.default_engine = 'orjson'
+
+# Corners of the [-1, 1]^3 cube, in the vertex order the box faces expect
+_UNIT_CUBE = np.array([
+    [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+    [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]
+], dtype=np.float64)
+
+# Triangles of a box over the _UNIT_CUBE corners
+_BOX_FACE_I = np.array([0, 0, 0, 1, 1, 4, 4, 5, 2, 2, 7, 7], dtype=np.uint16)
+_BOX_FACE_J = np.array([1, 2, 4, 2, 5, 5, 7, 6, 3, 6, 3, 6], dtype=np.uint16)
+_BOX_FACE_K = np.array([2, 3, 5, 6, 6, 1, 0, 1, 7, 7, 4, 2], dtype=np.uint16)
+
+class PlotlyURDFVisualizer(URDFModel):
+    def __init__(self, urdf_file, show_inertia=False, cylinder_segments=20):
         self.show_inertia = show_inertia
-        self.joints = []
-        self.links = []
+        # Number of sides used to tessellate cylinders; lower values shrink
+        # the vertex payload sent to the browser on every update
+        self.cylinder_segments = cylinder_segments
+        # Unit ring directions shared by every cylinder
+        theta = np.linspace(0, 2 * np.pi, cylinder_segments, endpoint=False)
+        self._ring_cos = np.cos(theta)
+        self._ring_sin = np.sin(theta)
+        self._cylinder_faces = self._build_cylinder_faces(cylinder_segments)
+        # Unit-length cylinder vertices per radius
+        self._cyl_cache = {}
         self.colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
-        self.parse_urdf()
-        
-    def parse_urdf(self):
-        """Parse the URDF file to extract joint and link information"""
-        tree = ET.parse(self.urdf_file)
-        root = tree.getroot()
-        
-        # Extract joints
-        for joint in root.findall('joint'):
-            joint_info = {
-                'name': joint.get('name'),
-                'type': joint.get('type'),
-                'parent': joint.find('parent').get('link'),
-                'child': joint.find('child').get('link'),
-                'origin': self._parse_origin(joint.find('origin')),
-                'axis': self._parse_axis(joint.find('axis')),
-                'limits': self._parse_limits(joint.find('limit'))
-            }
-            self.joints.append(joint_info)
+        self.link_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F']
+        self.joint_colors = ['#808080', '#FF8C00', '#87CEEB', '#9370DB', '#87CEEB', '#9370DB', '#4169E1']
+        super().__init__(urdf_file)
+        self._build_link_meshes()
+        self.static_traces = self._build_static_traces()
+        # Per-instance memo of moving-trace vertices, see robot_coordinates
+        self._cached_trace_coordinates = lru_cache(maxsize=256)(self._trace_coordinates)
+        
+    def _build_cylinder_faces(self, n_segments):
+        """Triangle indices i, j, k (uint16) of an n-segment capped cylinder.
+        
+        Side quads are two triangles each and the caps are fans, all wound
+        outward; modular indices close the seam without a duplicate vertex.
+        """
+        seg = np.arange(n_segments)
+        nxt = (seg + 1) % n_segments
+        center_bottom = np.full(n_segments, 2 * n_segments)
+        center_top = center_bottom + 1
         
-        # Extract links
-        for link in root.findall('link'):
-            link_info = {
-                'name': link.get('name'),
-                'visual': self._parse_visual(link.find('visual'))
-            }
-            self.links.append(link_info)
-    
-    def _parse_origin(self, origin):
-        if origin is None:
-            return {'xyz': [0, 0, 0], 'rpy': [0, 0, 0]}
-        xyz = [float(x) for x in origin.get('xyz', '0 0 0').split()]
-        rpy = [float(x) for x in origin.get('rpy', '0 0 0').split()]
-        return {'xyz': xyz, 'rpy': rpy}
+        i = np.concatenate([seg, seg + n_segments, center_bottom, center_top])
+        j = np.concatenate([nxt, nxt, nxt, seg + n_segments])
+        k = np.concatenate([seg + n_segments, nxt + n_segments, seg, nxt + n_segments])
+        
+        return i.astype(np.uint16), j.astype(np.uint16), k.astype(np.uint16)
     
-    def _parse_axis(self, axis):
-        if axis is None:
-            return [0, 0, 1]
-        return [float(x) for x in axis.get('xyz', '0 0 1').split()]
+    def _cylinder_template(self, radius):
+        """Local vertices (N x 3) of a unit-length capped cylinder, built once per radius.
+        
+        The length only scales z, so it is not part of the cache key.
+        """
+        key = float(radius)
+        template = self._cyl_cache.get(key)
+        if template is None:
+            ring = np.column_stack([radius * self._ring_cos, radius * self._ring_sin,
+                                    np.zeros(self.cylinder_segments)])
+            # Bottom ring, top ring, then the bottom and top cap centers
+            template = np.vstack([ring, ring + [0, 0, 1], [[0, 0, 0], [0, 0, 1]]])
+            template.flags.writeable = False
+            self._cyl_cache[key] = template
+        return template
     
-    def _parse_limits(self, limit):
-        if limit is None:
-            return {'lower': -np.pi, 'upper': np.pi}
-        return {
-            'lower': float(limit.get('lower', -np.pi)),
-            'upper': float(limit.get('upper', np.pi))
-        }
+    def _cylinder_geometry(self, radius, length):
+        """Return local cylinder vertices (N x 3) and triangle indices i, j, k"""
+        return (self._cylinder_template(radius) * [1.0, 1.0, length], *self._cylinder_faces)
     
-    def _parse_visual(self, visual):
-        if visual is None:
-            return None
+    def _box_geometry(self, size):
+        """Return local box vertices (8 x 3) and triangle indices i, j, k"""
+        half = np.asarray(size, dtype=np.float64) / 2
         
-        geom = visual.find('geometry')
-        if geom is None:
-            return None
-            
-        origin = self._parse_origin(visual.find('origin'))
-        
-        visual_info = {'origin': origin}
-        
-        if geom.find('cylinder') is not None:
-            cyl = geom.find('cylinder')
-            visual_info['type'] = 'cylinder'
-            visual_info['radius'] = float(cyl.get('radius'))
-            visual_info['length'] = float(cyl.get('length'))
-        elif geom.find('box') is not None:
-            box = geom.find('box')
-            visual_info['type'] = 'box'
-            visual_info['size'] = [float(x) for x in box.get('size').split()]
-        elif geom.find('mesh') is not None:
-            mesh = geom.find('mesh')
-            visual_info['type'] = 'mesh'
-            visual_info['filename'] = mesh.get('filename')
-            # For mesh files, we'll create a simple box representation
-            # You can enhance this later to load actual mesh files
-            visual_info['size'] = [0.05, 0.05, 0.05]  # Default size for placeholder
-        else:
-            return None
+        # Box centered in x/y, sitting on z = 0
+        vertices = (_UNIT_CUBE + [0, 0, 1]) * half
         
-        return visual_info
+        return vertices, _BOX_FACE_I, _BOX_FACE_J, _BOX_FACE_K
     
-    def rotation_matrix(self, roll, pitch, yaw):
-        """Create a rotation matrix from roll, pitch, yaw angles"""
-        R_x = np.array([[1, 0, 0],
-                        [0, np.cos(roll), -np.sin(roll)],
-                        [0, np.sin(roll), np.cos(roll)]])
-        
-        R_y = np.array([[np.cos(pitch), 0, np.sin(pitch)],
-                        [0, 1, 0],
-                        [-np.sin(pitch), 0, np.cos(pitch)]])
-        
-        R_z = np.array([[np.cos(yaw), -np.sin(yaw), 0],
-                        [np.sin(yaw), np.cos(yaw), 0],
-                        [0, 0, 1]])
-        
-        return R_z @ R_y @ R_x
+    def _visual_geometry(self, visual):
+        """Return local vertices and faces for a link visual, or None"""
+        if visual['type'] == 'cylinder':
+            return self._cylinder_geometry(visual['radius'], visual['length'])
+        elif visual['type'] == 'box' or visual['type'] == 'mesh':
+            return self._box_geometry(visual['size'])
+        return None
     
-    def forward_kinematics(self, joint_angles):
-        """Calculate the forward kinematics for given joint angles"""
-        transforms = []
-        current_transform = np.eye(4)
-        
-        for i, joint in enumerate(self.joints):
-            # Joint origin transform
-            origin = joint['origin']
-            rpy = origin['rpy']
-            xyz = origin['xyz']
-            
-            T_joint = np.eye(4)
-            T_joint[:3, :3] = self.rotation_matrix(rpy[0], rpy[1], rpy[2])
-            T_joint[:3, 3] = xyz
+    def _build_link_meshes(self):
+        """Pack all moving link visual vertices into one homogeneous (V, 4) array.
+        
+        Vertices are stored in their link frame (visual origin applied), with
+        self._link_of_vert mapping each vertex to its link so a whole frame
+        can be transformed by a single batched matmul. Links that can never
+        move are kept apart in self._static_link_meshes.
+        """
+        static_links = self._static_link_indices()
+        self._link_meshes = []
+        self._static_link_meshes = []
+        verts = []
+        link_of_vert = []
+        offset = 0
+        
+        for link_idx, link in enumerate(self.links):
+            visual = link['visual']
+            # Link n is placed by joint n; links past the last joint have
+            # nothing to place them and are not drawn
+            if not visual or link_idx > len(self.joints):
+                continue
+            geometry = self._visual_geometry(visual)
+            if geometry is None:
+                continue
+            vertices, i, j, k = geometry
             
-            # Apply joint rotation
-            angle = joint_angles[i]
-            axis = joint['axis']
+            T_visual = visual['T_visual']
+            vertices = vertices @ T_visual[:3, :3].T + T_visual[:3, 3]
             
-            if abs(axis[2]) > 0.5:  # Z-axis rotation
-                T_rotation = np.eye(4)
-                T_rotation[:3, :3] = self.rotation_matrix(0, 0, angle)
-            elif abs(axis[1]) > 0.5:  # Y-axis rotation
-                T_rotation = np.eye(4)
-                T_rotation[:3, :3] = self.rotation_matrix(0, angle, 0)
-            elif abs(axis[0]) > 0.5:  # X-axis rotation
-                T_rotation = np.eye(4)
-                T_rotation[:3, :3] = self.rotation_matrix(angle, 0, 0)
+            # Base link is gray, other links cycle through the palette
+            if link_idx == 0:
+                color = '#808080'
             else:
-                T_rotation = np.eye(4)
+                color = self.colors[(link_idx - 1) % len(self.colors)]
             
-            current_transform = current_transform @ T_joint @ T_rotation
-            transforms.append(current_transform.copy())
-        
-        return transforms
+            if link_idx in static_links:
+                self._static_link_meshes.append({
+                    'link': link_idx, 'vertices': vertices,
+                    'i': i, 'j': j, 'k': k,
+                    'color': color
+                })
+                continue
+            
+            n = len(vertices)
+            self._link_meshes.append({
+                'start': offset, 'stop': offset + n,
+                'i': i, 'j': j, 'k': k,
+                'color': color
+            })
+            verts.append(vertices)
+            link_of_vert.append(np.full(n, link_idx))
+            offset += n
+        
+        if verts:
+            verts = np.vstack(verts)
+            # float32 halves the payload sent to the browser
+            self._verts_h = np.hstack([verts, np.ones((len(verts), 1))]).astype(np.float32)
+            self._link_of_vert = np.concatenate(link_of_vert)
+        else:
+            self._verts_h = np.empty((0, 4), dtype=np.float32)
+            self._link_of_vert = np.empty(0, dtype=int)
+        
+        # Faces and colors of the merged moving-link mesh never change
+        self._link_faces = self._merge_faces([
+            (mesh['stop'] - mesh['start'], mesh['i'], mesh['j'], mesh['k'], mesh['color'])
+            for mesh in self._link_meshes
+        ]) if self._link_meshes else None
     
-    def create_cylinder_mesh(self, radius, length, transform, color):
-        """Create a cylinder mesh"""
-        n_segments = 20
-        theta = np.linspace(0, 2 * np.pi, n_segments)
-        z = np.array([0, length])
-        
-        # Create cylinder points
-        x = []
-        y = []
-        z_coords = []
-        
-        for zi in z:
-            for t in theta:
-                point = np.array([radius * np.cos(t), radius * np.sin(t), zi, 1])
-                transformed = transform @ point
-                x.append(transformed[0])
-                y.append(transformed[1])
-                z_coords.append(transformed[2])
-        
-        # Create faces
-        i = []
-        j = []
-        k = []
-        
-        for seg in range(n_segments - 1):
-            # Side faces
-            i.extend([seg, seg, seg + n_segments])
-            j.extend([seg + 1, seg + n_segments, seg + n_segments + 1])
-            k.extend([seg + n_segments, seg + n_segments + 1, seg + 1])
-        
-        # Close the cylinder
-        i.extend([n_segments - 1, n_segments - 1, 2 * n_segments - 1])
-        j.extend([0, n_segments, n_segments])
-        k.extend([n_segments, 2 * n_segments - 1, 0])
-        
-        # Top and bottom caps
-        center_bottom = transform @ np.array([0, 0, 0, 1])
-        center_top = transform @ np.array([0, 0, length, 1])
-        
-        x.extend([center_bottom[0], center_top[0]])
-        y.extend([center_bottom[1], center_top[1]])
-        z_coords.extend([center_bottom[2], center_top[2]])
-        
-        center_bottom_idx = len(x) - 2
-        center_top_idx = len(x) - 1
-        
-        for seg in range(n_segments - 1):
-            i.extend([center_bottom_idx, center_top_idx])
-            j.extend([seg, seg + n_segments])
-            k.extend([seg + 1, seg + n_segments + 1])
-        
-        i.extend([center_bottom_idx, center_top_idx])
-        j.extend([n_segments - 1, 2 * n_segments - 1])
-        k.extend([0, n_segments])
+    def _merge_faces(self, parts):
+        """Offset and join the faces of (n_vertices, i, j, k, color) parts.
         
-        return go.Mesh3d(
-            x=x, y=y, z=z_coords,
-            i=i, j=j, k=k,
-            color=color,
-            opacity=0.7,
-            lighting=dict(ambient=0.5, diffuse=0.8, specular=0.5),
-            lightposition=dict(x=100, y=100, z=100)
+        Returns i, j, k in the smallest unsigned index type that can address
+        every vertex, plus one color per vertex.
+        """
+        counts = [part[0] for part in parts]
+        offsets = np.cumsum([0] + counts[:-1])
+        index_dtype = np.uint16 if sum(counts) <= np.iinfo(np.uint16).max else np.uint32
+        i, j, k = (
+            np.concatenate([np.asarray(part[col]) + off for part, off in zip(parts, offsets)]).astype(index_dtype)
+            for col in (1, 2, 3)
         )
+        vertexcolor = [part[4] for part in parts for _ in range(part[0])]
+        return i, j, k, vertexcolor
     
-    def create_box_mesh(self, size, transform, color):
-        """Create a box mesh"""
-        sx, sy, sz = size
-        
-        # Define box vertices
-        vertices = np.array([
-            [-sx/2, -sy/2, 0], [sx/2, -sy/2, 0], [sx/2, sy/2, 0], [-sx/2, sy/2, 0],
-            [-sx/2, -sy/2, sz], [sx/2, -sy/2, sz], [sx/2, sy/2, sz], [-sx/2, sy/2, sz]
-        ])
-        
-        # Transform vertices
-        x, y, z = [], [], []
-        for v in vertices:
-            point = np.append(v, 1)
-            transformed = transform @ point
-            x.append(transformed[0])
-            y.append(transformed[1])
-            z.append(transformed[2])
-        
-        # Define faces
-        i = [0, 0, 0, 1, 1, 4, 4, 5, 2, 2, 7, 7]
-        j = [1, 2, 4, 2, 5, 5, 7, 6, 3, 6, 3, 6]
-        k = [2, 3, 5, 6, 6, 1, 0, 1, 7, 7, 4, 2]
-        
+    def _mesh_trace(self, vertices, i, j, k, vertexcolor, opacity):
+        """Wrap world-space vertices and merged faces in a Mesh3d trace"""
         return go.Mesh3d(
-            x=x, y=y, z=z,
+            x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
             i=i, j=j, k=k,
-            color=color,
-            opacity=0.7,
+            vertexcolor=vertexcolor,
+            opacity=opacity,
+            flatshading=True,
             lighting=dict(ambient=0.5, diffuse=0.8, specular=0.5),
             lightposition=dict(x=100, y=100, z=100)
         )
     
-    def create_link_cylinder(self, start_pos, end_pos, radius, color):
-        """Create a cylinder connecting two points (representing a link)"""
-        # Calculate direction and length
-        direction = end_pos - start_pos
-        length = np.linalg.norm(direction)
-        
-        if length < 1e-6:  # Avoid zero-length cylinders
-            return None
-        
-        direction = direction / length
-        
-        # Create cylinder along z-axis first
-        n_segments = 20
-        theta = np.linspace(0, 2 * np.pi, n_segments)
-        z = np.array([0, length])
-        
-        x = []
-        y = []
-        z_coords = []
-        
-        for zi in z:
-            for t in theta:
-                point = np.array([radius * np.cos(t), radius * np.sin(t), zi])
-                x.append(point[0])
-                y.append(point[1])
-                z_coords.append(point[2])
-        
-        # Create transformation matrix to align cylinder with link direction
-        # Find rotation that maps [0, 0, 1] to direction
-        z_axis = np.array([0, 0, 1])
-        if np.allclose(direction, z_axis):
-            rotation = np.eye(3)
-        elif np.allclose(direction, -z_axis):
-            rotation = np.array([[-1, 0, 0], [0, 1, 0], [0, 0, -1]])
-        else:
-            v = np.cross(z_axis, direction)
-            s = np.linalg.norm(v)
-            c = np.dot(z_axis, direction)
-            vx = np.array([[0, -v[2], v[1]], [v[2], 0, -v[0]], [-v[1], v[0], 0]])
-            rotation = np.eye(3) + vx + vx @ vx * ((1 - c) / (s * s))
-        
-        # Transform all points
-        x_transformed = []
-        y_transformed = []
-        z_transformed = []
-        
-        for i in range(len(x)):
-            point = np.array([x[i], y[i], z_coords[i]])
-            transformed = rotation @ point + start_pos
-            x_transformed.append(transformed[0])
-            y_transformed.append(transformed[1])
-            z_transformed.append(transformed[2])
-        
-        # Create faces
-        i_faces = []
-        j_faces = []
-        k_faces = []
-        
-        for seg in range(n_segments - 1):
-            i_faces.extend([seg, seg, seg + n_segments])
-            j_faces.extend([seg + 1, seg + n_segments, seg + n_segments + 1])
-            k_faces.extend([seg + n_segments, seg + n_segments + 1, seg + 1])
-        
-        # Close the cylinder
-        i_faces.extend([n_segments - 1, n_segments - 1, 2 * n_segments - 1])
-        j_faces.extend([0, n_segments, n_segments])
-        k_faces.extend([n_segments, 2 * n_segments - 1, 0])
-        
-        # Add caps
-        x_transformed.extend([start_pos[0], end_pos[0]])
-        y_transformed.append(start_pos[1])
-        y_transformed.append(end_pos[1])
-        z_transformed.append(start_pos[2])
-        z_transformed.append(end_pos[2])
-        
-        center_bottom_idx = len(x_transformed) - 2
-        center_top_idx = len(x_transformed) - 1
-        
-        for seg in range(n_segments - 1):
-            i_faces.extend([center_bottom_idx, center_top_idx])
-            j_faces.extend([seg, seg + n_segments])
-            k_faces.extend([seg + 1, seg + n_segments + 1])
-        
-        i_faces.extend([center_bottom_idx, center_top_idx])
-        j_faces.extend([n_segments - 1, 2 * n_segments - 1])
-        k_faces.extend([0, n_segments])
+    def _concat_meshes(self, parts, opacity):
+        """Merge (vertices, i, j, k, color) parts into a single Mesh3d trace.
         
-        return go.Mesh3d(
-            x=x_transformed, y=y_transformed, z=z_transformed,
-            i=i_faces, j=j_faces, k=k_faces,
-            color=color,
-            opacity=0.8,
-            lighting=dict(ambient=0.5, diffuse=0.8, specular=0.5),
-            lightposition=dict(x=100, y=100, z=100)
-        )
+        One trace is one WebGL draw call; face indices are offset into the
+        concatenated vertex array and part colors become per-vertex colors.
+        """
+        vertices = np.vstack([part[0] for part in parts]).astype(np.float32)
+        faces = self._merge_faces([(len(part[0]), *part[1:]) for part in parts])
+        return self._mesh_trace(vertices, *faces, opacity)
     
-    def create_joint_connector(self, position, size, color):
-        """Create a small box at joint position to represent the joint connector"""
-        s = size
-        vertices = np.array([
-            [-s, -s, -s], [s, -s, -s], [s, s, -s], [-s, s, -s],
-            [-s, -s, s], [s, -s, s], [s, s, s], [-s, s, s]
-        ])
-        
-        x = (vertices[:, 0] + position[0]).tolist()
-        y = (vertices[:, 1] + position[1]).tolist()
-        z = (vertices[:, 2] + position[2]).tolist()
-        
-        i = [0, 0, 0, 1, 1, 4, 4, 5, 2, 2, 7, 7]
-        j = [1, 2, 4, 2, 5, 5, 7, 6, 3, 6, 3, 6]
-        k = [2, 3, 5, 6, 6, 1, 0, 1, 7, 7, 4, 2]
+    def _build_static_traces(self):
+        """Build the traces that no joint angle can move, once.
         
-        return go.Mesh3d(
-            x=x, y=y, z=z,
-            i=i, j=j, k=k,
-            color=color,
-            opacity=0.9,
-            lighting=dict(ambient=0.5, diffuse=0.8, specular=0.5),
-            lightposition=dict(x=100, y=100, z=100)
-        )
+        In full mode these are the meshes of the links in
+        _static_link_indices; the skeleton is a single trace and has none.
+        """
+        if not self.show_inertia:
+            return []
+        
+        transforms = self.forward_kinematics([0.0] * len(self.joints))
+        T_stack = self._link_transform_stack(transforms)
+        parts = []
+        for mesh in self._static_link_meshes:
+            T = T_stack[mesh['link']]
+            vertices = mesh['vertices'] @ T[:3, :3].T + T[:3, 3]
+            parts.append((vertices, mesh['i'], mesh['j'], mesh['k'], mesh['color']))
+        
+        return [self._concat_meshes(parts, 0.7)] if parts else []
     
-    def create_robot_traces(self, joint_angles):
-        """Create all traces for the robot - skeleton or full visualization"""
-        traces = []
+    def _trace_coordinates(self, joint_angles):
+        """World-space vertices (float32, N x 3) of each trace that moves"""
         transforms = self.forward_kinematics(joint_angles)
+        positions = self.joint_positions(transforms)
+        coords = [positions]
+        
+        if self.show_inertia and self._link_meshes:
+            # Transform every moving link vertex at once
+            T_stack = self._link_transform_stack(transforms)
+            world = np.einsum('vij,vj->vi', T_stack[self._link_of_vert], self._verts_h)[:, :3]
+            coords.insert(0, world)
+        
+        # Shared through the cache, so make sure nobody edits them in place
+        for vertices in coords:
+            vertices.flags.writeable = False
+        return tuple(coords)
+    
+    def robot_coordinates(self, joint_angles):
+        """Vertices of the moving traces, in create_robot_traces order.
+        
+        Memoized on the angles rounded to 4 decimals, so revisiting a pose
+        (e.g. dragging a slider back and forth) skips FK and mesh work.
+        """
+        return self._cached_trace_coordinates(tuple(round(float(a), 4) for a in joint_angles))
+    
+    def create_robot_traces(self, joint_angles):
+        """Create all traces for the robot - skeleton or full visualization
+        
+        Traces that never move (see static_traces) come first, then the
+        traces that depend on the angles.
+        """
+        traces = list(self.static_traces)
+        coords = self.robot_coordinates(joint_angles)
+        positions = coords[-1]
         
         if self.show_inertia:
             # Full visualization with cylinders and boxes (inertia visualization)
             
-            # Draw base link (if it has visual)
-            if self.links[0]['visual']:
-                visual = self.links[0]['visual']
-                T_visual = np.eye(4)
-                T_visual[:3, 3] = visual['origin']['xyz']
-                T_visual[:3, :3] = self.rotation_matrix(*visual['origin']['rpy'])
-                
-                if visual['type'] == 'cylinder':
-                    traces.append(self.create_cylinder_mesh(
-                        visual['radius'], visual['length'], T_visual, '#808080'
-                    ))
-                elif visual['type'] == 'box' or visual['type'] == 'mesh':
-                    traces.append(self.create_box_mesh(
-                        visual['size'], T_visual, '#808080'
-                    ))
-            
-            # Draw other links
-            for i, (link, transform) in enumerate(zip(self.links[1:], transforms)):
-                if link['visual']:
-                    visual = link['visual']
-                    T_visual = np.eye(4)
-                    T_visual[:3, 3] = visual['origin']['xyz']
-                    T_visual[:3, :3] = self.rotation_matrix(*visual['origin']['rpy'])
-                    
-                    final_transform = transform @ T_visual
-                    color = self.colors[i % len(self.colors)]
-                    
-                    if visual['type'] == 'cylinder':
-                        traces.append(self.create_cylinder_mesh(
-                            visual['radius'], visual['length'], final_transform, color
-                        ))
-                    elif visual['type'] == 'box' or visual['type'] == 'mesh':
-                        traces.append(self.create_box_mesh(
-                            visual['size'], final_transform, color
-                        ))
+            # Every moving link in one mesh
+            if self._link_meshes:
+                traces.append(self._mesh_trace(coords[0], *self._link_faces, 0.7))
             
             # Draw joint connections
-            positions = [[0, 0, 0]]
-            for transform in transforms:
-                positions.append(transform[:3, 3].tolist())
-            positions = np.array(positions)
-            
             traces.append(go.Scatter3d(
                 x=positions[:, 0],
                 y=positions[:, 1],
@@ -429,48 +289,77 @@ class PlotlyURDFVisualizer:
                 showlegend=False
             ))
         else:
-            # Skeleton visualization with cylindrical links and joint connectors
-            
-            # Calculate all joint positions
-            positions = [[0, 0, 0]]  # Base position
-            for transform in transforms:
-                positions.append(transform[:3, 3].tolist())
-            positions = np.array(positions)
+            # Skeleton visualization: one line-and-marker trace through every
+            # joint, so a frame is a single draw call with no triangles
+            n_points = len(positions)
             
-            # Create cylindrical links between joints
-            link_radius = 0.015  # 15mm radius for links
-            link_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', '#F7DC6F']
-            
-            for i in range(len(positions) - 1):
-                cylinder = self.create_link_cylinder(
-                    positions[i], 
-                    positions[i+1], 
-                    link_radius,
-                    link_colors[i % len(link_colors)]
-                )
-                if cylinder:
-                    traces.append(cylinder)
-            
-            # Create joint connectors (small boxes at each joint)
-            joint_colors = ['#808080', '#FF8C00', '#87CEEB', '#9370DB', '#87CEEB', '#9370DB', '#4169E1']
-            joint_size = 0.02  # 20mm cube for joints
-            
-            for i, (pos, color) in enumerate(zip(positions, joint_colors)):
-                traces.append(self.create_joint_connector(pos, joint_size, color))
+            traces.append(go.Scatter3d(
+                x=positions[:, 0],
+                y=positions[:, 1],
+                z=positions[:, 2],
+                mode='lines+markers',
+                line=dict(color=[self.link_colors[i % len(self.link_colors)] for i in range(n_points)],
+                          width=8),
+                marker=dict(size=12, color=[self.joint_colors[i % len(self.joint_colors)]
+                                            for i in range(n_points)]),
+                name='Links',
+                showlegend=False
+            ))
         
         return traces
     
+    def precompute_all_configs(self, n_steps=100):
+        """Coordinates of every moving trace for every slider step.
+        
+        Returns one (n_joints, n_steps, V, 3) float32 array per trace, in
+        robot_coordinates order. Slider j sweeps joint j across its limits
+        with the other joints at zero.
+        """
+        n_joints = len(self.joints)
+        
+        # (n_joints, n_steps, n_joints) angle grid: only joint j moves in slider j
+        angles = np.zeros((n_joints, n_steps, n_joints))
+        for joint_idx, joint in enumerate(self.joints):
+            limits = joint['limits']
+            angles[joint_idx, :, joint_idx] = np.linspace(limits['lower'], limits['upper'], n_steps)
+        
+        # Forward kinematics for every step in one batched call
+        transforms = self.fk_batch(angles.reshape(-1, n_joints))
+        
+        positions = np.zeros((len(transforms), n_joints + 1, 3), dtype=np.float32)
+        positions[:, 1:] = transforms[:, :, :3, 3]
+        coords = [positions]
+        
+        if self.show_inertia and self._link_meshes:
+            # Every moving link vertex of every step at once
+            T_stack = self._link_transform_stack(transforms)
+            world = np.einsum('bvij,vj->bvi', T_stack[:, self._link_of_vert], self._verts_h)[..., :3]
+            coords.insert(0, world)
+        
+        return tuple(c.reshape(n_joints, n_steps, -1, 3) for c in coords)
+    
     def visualize(self):
         """Create interactive Plotly visualization with individual joint control"""
         # Initial joint angles (all zeros)
         initial_angles = [0.0] * len(self.joints)
         
-        # Create figure
-        fig = go.Figure()
-        
-        # Add initial robot traces
-        for trace in self.create_robot_traces(initial_angles):
-            fig.add_trace(trace)
+        # Create figure; the moving traces come last, in robot_coordinates
+        # order, and only their coordinates are swapped by the sliders
+        fig = go.Figure(data=self.create_robot_traces(initial_angles))
+        
+        # Moving-trace coordinates for every slider step, one named frame per step
+        n_steps = 100
+        coords_all = self.precompute_all_configs(n_steps)
+        moving_idx = list(range(len(fig.data) - len(coords_all), len(fig.data)))
+        moving_types = [type(fig.data[i]) for i in moving_idx]
+        frames = []
+        
+        # Jump straight to a step's frame (shared by every step)
+        animate_opts = {
+            'mode': 'immediate',
+            'frame': {'duration': 0, 'redraw': True},
+            'transition': {'duration': 0}
+        }
         
         # Create sliders for each joint
         sliders = []
@@ -480,23 +369,27 @@ class PlotlyURDFVisualizer:
             lower = joint['limits']['lower']
             upper = joint['limits']['upper']
             
-            # Create steps for this slider
-            n_steps = 100
-            steps = []
+            # Step angles and labels for this slider, formatted from plain floats
+            angles = np.linspace(lower, upper, n_steps)
+            labels = [f"{a:.3f} rad ({d:.1f}°)"
+                      for a, d in zip(angles.tolist(), np.degrees(angles).tolist())]
+            frame_names = [f'j{joint_idx}_s{step_idx}' for step_idx in range(n_steps)]
             
-            for step_idx in range(n_steps):
-                # Calculate angle for this step
-                angle = lower + (upper - lower) * step_idx / (n_steps - 1)
-                
-                # Create joint angles array with this joint at the current angle
-                # We'll use a naming convention to identify which joint to update
-                step_label = f"{angle:.3f} rad ({np.degrees(angle):.1f}°)"
-                
-                steps.append({
-                    'method': 'skip',  # We'll handle updates via callback
-                    'label': step_label,
-                    'value': angle
-                })
+            # Only the moving traces' x/y/z change between frames
+            frames.extend(
+                go.Frame(
+                    name=name,
+                    data=[trace_type(x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2])
+                          for trace_type, vertices in zip(moving_types, step_coords)],
+                    traces=moving_idx
+                )
+                for name, *step_coords in zip(frame_names, *(c[joint_idx] for c in coords_all))
+            )
+            
+            steps = [
+                {'method': 'animate', 'args': [[name], animate_opts], 'label': label, 'value': angle}
+                for name, label, angle in zip(frame_names, labels, angles.tolist())
+            ]
             
             slider = {
                 'active': int(n_steps / 2),  # Start at middle (near 0)
@@ -540,6 +433,7 @@ class PlotlyURDFVisualizer:
             margin=dict(l=0, r=0, b=150, t=50),
             height=900
         )
+        fig.frames = frames
         
         # Show in browser
         fig.show()
@@ -548,7 +442,7 @@ class PlotlyURDFVisualizer:
         print("Interactive 3D Robot Arm Visualization")
         print("="*60)
         print(f"\nVisualization Mode: {'Full (with inertia/mass)' if self.show_inertia else 'Skeleton'}")
-        print("\nNote: Plotly sliders in Python have limitations.")
+        print("\nNote: each slider sweeps one joint from the home pose.")
         print("For full interactive control, please use the web app version.")
         print("\nControls:")
         print("  • Use mouse to rotate, zoom, and pan the view")
@@ -560,6 +454,81 @@ class PlotlyURDFVisualizer:
         print("  Config 2: C1=0, C2=0, C3=0, C4=0, C5=0, C6=0 (Home)")
         print("\nThe visualization is now open in your browser!")
         print("="*60 + "\n")
+    
+    def visualize_pyvista(self):
+        """Interactive VTK (GPU) window with one slider per joint; needs PyVista.
+        
+        Each robot part is a single PolyData built once; a slider move only
+        overwrites its points in place, so VTK re-uploads the vertex buffer
+        and redraws without rebuilding any geometry.
+        """
+        if not PYVISTA_AVAILABLE:
+            raise ImportError("visualize_pyvista needs PyVista: pip install pyvista")
+        
+        def rgb(colors):
+            return np.array([[int(c[i:i + 2], 16) for i in (1, 3, 5)] for c in colors], dtype=np.uint8)
+        
+        def polydata(vertices, i, j, k):
+            faces = np.column_stack([np.full(len(i), 3), i, j, k]).ravel()
+            return pv.PolyData(np.array(vertices, dtype=np.float32), faces)
+        
+        angles = [0.0] * len(self.joints)
+        coords = self.robot_coordinates(angles)
+        positions = coords[-1]
+        n_points = len(positions)
+        plotter = pv.Plotter(window_size=(1200, 900), title='6-Axis Robotic Arm - Interactive Joint Control')
+        
+        # Fixed links are drawn once and never touched again
+        for trace in self.static_traces:
+            mesh = polydata(np.column_stack([trace.x, trace.y, trace.z]), trace.i, trace.j, trace.k)
+            plotter.add_mesh(mesh, scalars=rgb(trace.vertexcolor), rgb=True, opacity=0.7)
+        
+        # Parts whose points are rewritten on every slider move, in the
+        # order of robot_coordinates
+        moving = []
+        if self.show_inertia and self._link_meshes:
+            i, j, k, vertexcolor = self._link_faces
+            links = polydata(coords[0], i, j, k)
+            plotter.add_mesh(links, scalars=rgb(vertexcolor), rgb=True, opacity=0.7)
+            moving.append(links)
+        
+        skeleton = pv.lines_from_points(np.array(positions, dtype=np.float32))
+        joints = pv.PolyData(np.array(positions, dtype=np.float32))
+        if self.show_inertia:
+            plotter.add_mesh(skeleton, color='black', line_width=4)
+            plotter.add_mesh(joints, color='red', point_size=10, render_points_as_spheres=True)
+        else:
+            link_colors = [self.link_colors[i % len(self.link_colors)] for i in range(n_points)]
+            joint_colors = [self.joint_colors[i % len(self.joint_colors)] for i in range(n_points)]
+            plotter.add_mesh(skeleton, scalars=rgb(link_colors), rgb=True,
+                             line_width=8, render_lines_as_tubes=True)
+            plotter.add_mesh(joints, scalars=rgb(joint_colors), rgb=True,
+                             point_size=20, render_points_as_spheres=True)
+        
+        def set_angle(value, joint_idx):
+            angles[joint_idx] = value
+            *mesh_coords, positions = self.robot_coordinates(angles)
+            for part, vertices in zip(moving, mesh_coords):
+                part.points[:] = vertices
+            skeleton.points[:] = positions
+            joints.points[:] = positions
+        
+        # Sliders stacked down the left edge
+        for joint_idx, joint in enumerate(self.joints):
+            y = 0.92 - joint_idx * 0.14
+            plotter.add_slider_widget(
+                lambda value, joint_idx=joint_idx: set_angle(value, joint_idx),
+                [joint['limits']['lower'], joint['limits']['upper']],
+                value=0.0,
+                title=f'C{joint_idx + 1} (J{joint_idx + 1})',
+                pointa=(0.02, y), pointb=(0.3, y),
+                fmt='%.3f rad',
+                interaction_event='always'
+            )
+        
+        plotter.add_axes()
+        plotter.camera_position = [(0.5, 0.5, 0.6), (0.0, 0.0, 0.25), (0.0, 0.0, 1.0)]
+        plotter.show()
 
 def main():
     parser = argparse.ArgumentParser(
@@ -570,6 +539,7 @@ Examples:
   python visualization.py                    # Skeleton view (default)
   python visualization.py --inertia          # Full view with inertia/mass
   python visualization.py -i                 # Short form
+  python visualization.py --pyvista          # Native VTK window (needs PyVista)
         """
     )
     parser.add_argument(
@@ -577,11 +547,19 @@ Examples:
         action='store_true',
         help='Show full visualization with inertia and mass (cylinders/boxes)'
     )
+    parser.add_argument(
+        '--pyvista',
+        action='store_true',
+        help='Render in a native VTK window with live sliders (requires PyVista)'
+    )
     
     args = parser.parse_args()
     
     visualizer = PlotlyURDFVisualizer('URDF/mycobotpro320.urdf', show_inertia=args.inertia)
-    visualizer.visualize()
+    if args.pyvista:
+        visualizer.visualize_pyvista()
+    else:
+        visualizer.visualize()
 
 if __name__ == "__main__":
     main()